@@ -1,9 +1,29 @@
 """Streamlit UI entry point for the AML monitoring agent."""
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 import streamlit as st
 
-from main import run_pipeline
+from main import DEFAULT_DATA_PATH, DEFAULT_FEEDBACK_PATH, DEFAULT_RULES_PATH, run_pipeline
+
+
+def _mtime(path: Path) -> Optional[int]:
+    """Modification time used as a cache key; None when the file is absent."""
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+@st.cache_data(show_spinner=False)
+def _cached_run(
+    data_mtime: Optional[int], rules_mtime: Optional[int], feedback_mtime: Optional[int]
+) -> Dict[str, Any]:
+    """Run the pipeline once per combination of input file versions."""
+    return run_pipeline()
+
+
+@st.cache_data(show_spinner=False)
+def _read_text(path_str: str, mtime: Optional[int]) -> str:
+    """Read a file's text once per modification time."""
+    return Path(path_str).read_text()
 
 
 def main() -> None:
@@ -12,14 +32,16 @@ def main() -> None:
     st.caption("Trigger the end-to-end monitoring pipeline on the sample dataset.")
 
     if st.button("Run pipeline"):
-        summary = run_pipeline()
+        summary = _cached_run(
+            _mtime(DEFAULT_DATA_PATH), _mtime(DEFAULT_RULES_PATH), _mtime(DEFAULT_FEEDBACK_PATH)
+        )
         st.success("Pipeline execution completed.")
         st.json(summary)
 
     data_path = Path("data") / "sample.csv"
     st.sidebar.header("Data Overview")
     if data_path.exists():
-        st.sidebar.code(data_path.read_text(), language="csv")
+        st.sidebar.code(_read_text(str(data_path), _mtime(data_path)), language="csv")
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+import pandas as pd
+
 from src import anomaly, features, ingest, merge, report, rules, utils
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -12,6 +14,10 @@ DEFAULT_DATA_PATH = BASE_DIR / "data" / "sample.csv"
 DEFAULT_RULES_PATH = BASE_DIR / "config" / "rules.yaml"
 DEFAULT_FEEDBACK_PATH = BASE_DIR / "data" / "feedback.csv"
 
+# Copy-on-Write is always on from pandas 3.0; opt in explicitly on older releases.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 
 def run_pipeline(
     data_path: Path | str = DEFAULT_DATA_PATH,
@@ -19,15 +25,17 @@ def run_pipeline(
     feedback_path: Path | str = DEFAULT_FEEDBACK_PATH,
 ) -> Dict[str, Any]:
     """Execute the AML pipeline on the provided resources."""
-    transactions = ingest.load_transactions(data_path)
     rules_config = utils.load_yaml(rules_path)
+    usecols = [*ingest.REQUIRED_COLS, *rules.referenced_fields(rules_config)]
+    transactions = ingest.load_transactions(data_path, usecols=usecols)
     rule_matches = rules.apply_rules(transactions, rules_config)
 
-    feature_table = features.build_features(transactions)
-    scored_transactions = anomaly.score_transactions(feature_table)
-    enriched_transactions = merge.merge_results(scored_transactions, rule_matches)
+    # Each stage adds its columns to the same frame rather than copying it.
+    features.build_features(transactions, inplace=True)
+    anomaly.score_transactions(transactions, inplace=True)
+    merge.merge_results(transactions, rule_matches, inplace=True)
 
-    return report.generate_report(enriched_transactions, rule_matches, feedback_path)
+    return report.generate_report(transactions, rule_matches, feedback_path)
 
 
 def main() -> None:
@@ -1,16 +1,24 @@
 """Simple anomaly scoring logic."""
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
-def score_transactions(features: pd.DataFrame, threshold: float = 2.5) -> pd.DataFrame:
-    """Attach anomaly scores and labels to the feature table."""
-    scored = features.copy()
+def score_transactions(
+    features: pd.DataFrame, threshold: float = 2.5, inplace: bool = False
+) -> pd.DataFrame:
+    """Attach anomaly scores and labels to the feature table.
+
+    With ``inplace=True`` the score columns are added to ``features`` itself.
+    """
+    scored = features if inplace else features.copy(deep=False)
     if "amount_zscore" in scored.columns:
-        scored["anomaly_score"] = scored["amount_zscore"].abs()
+        zscores = scored["amount_zscore"].to_numpy(dtype=np.float64, na_value=np.nan)
+        score = np.abs(zscores)
     else:
-        scored["anomaly_score"] = 0.0
+        score = np.zeros(len(scored))
 
-    scored["is_anomalous"] = scored["anomaly_score"] >= threshold
+    scored["anomaly_score"] = score
+    scored["is_anomalous"] = score >= threshold
     return scored
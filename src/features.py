@@ -1,27 +1,58 @@
 """Feature engineering routines."""
 from __future__ import annotations
 
+import math
+
+import numpy as np
 import pandas as pd
+from numba import njit
+from pandas.api.types import is_datetime64_any_dtype
+
 
+@njit(cache=True)
+def _zscore(values: np.ndarray) -> np.ndarray:
+    """Population z-score in two passes (Welford mean/variance, then scale), skipping NaNs."""
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        if math.isnan(x):
+            continue
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+
+    out = np.empty(values.size)
+    std = math.sqrt(m2 / count) if count else math.nan
+    for i in range(values.size):
+        if std == 0.0:
+            out[i] = 0.0
+        else:
+            out[i] = (values[i] - mean) / std
+    return out
 
-def build_features(transactions: pd.DataFrame) -> pd.DataFrame:
-    """Engineer lightweight features for downstream scoring."""
-    features = transactions.copy()
+
+def build_features(transactions: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """Engineer lightweight features for downstream scoring.
+
+    With ``inplace=True`` the feature columns are added to ``transactions`` itself.
+    """
+    features = transactions if inplace else transactions.copy(deep=False)
 
     if "timestamp" in features.columns:
-        features["txn_timestamp"] = pd.to_datetime(features["timestamp"], errors="coerce")
+        timestamps = features["timestamp"]
+        if not is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors="coerce")
+        features["txn_timestamp"] = timestamps
         features["txn_hour"] = features["txn_timestamp"].dt.hour
     else:
         features["txn_timestamp"] = pd.NaT
         features["txn_hour"] = pd.NA
 
     if "amount" in features.columns:
-        amount = features["amount"].astype(float)
-        std = amount.std(ddof=0)
-        if std == 0:
-            features["amount_zscore"] = 0.0
-        else:
-            features["amount_zscore"] = (amount - amount.mean()) / std
+        amount = features["amount"].to_numpy(dtype=np.float64, na_value=np.nan)
+        features["amount_zscore"] = _zscore(amount)
     else:
         features["amount_zscore"] = 0.0
 
@@ -2,18 +2,62 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 
+# Columns read by the feature, rule and reporting stages.
+REQUIRED_COLS = [
+    "txn_id",
+    "timestamp",
+    "customer_id",
+    "amount",
+    "currency",
+    "country",
+    "country_src",
+    "country_dst",
+    "channel",
+    "kyc_verified",
+    "pep_flag",
+]
 
-def load_transactions(csv_path: Path | str) -> pd.DataFrame:
-    """Load the transaction ledger from a CSV file."""
+# Explicit column types for the pyarrow CSV reader; absent columns are ignored.
+_SCHEMA = {
+    "txn_id": "string",
+    "amount": "float64",
+    "country": "string",
+    # Low-cardinality codes are categorical so normalisation touches labels, not rows.
+    "country_src": "category",
+    "country_dst": "category",
+    "currency": "category",
+    "channel": "category",
+    "kyc_verified": "boolean",
+    "pep_flag": "boolean",
+}
+
+
+def load_transactions(csv_path: Path | str, usecols: Iterable[str] | None = None) -> pd.DataFrame:
+    """Load the transaction ledger from a CSV file.
+
+    When ``usecols`` is given only those columns (plus ``txn_id``) are parsed;
+    names missing from the file are ignored.
+    """
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(f"Transaction file not found: {path}")
 
-    frame = pd.read_csv(path)
+    columns = None
+    if usecols is not None:
+        wanted = set(usecols) | {"txn_id"}
+        header = pd.read_csv(path, nrows=0).columns
+        columns = [col for col in header if col in wanted]
+
+    frame = pd.read_csv(path, engine="pyarrow", dtype=_SCHEMA, usecols=columns)
     if "txn_id" not in frame.columns:
         raise ValueError("Expected a 'txn_id' column in the transactions file.")
+    # pyarrow only infers timestamps when every value parses; coerce the rest once here.
+    if "timestamp" in frame.columns and not is_datetime64_any_dtype(frame["timestamp"]):
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], errors="coerce", utc=True)
 
     return frame
@@ -1,20 +1,22 @@
 """Combine rule and anomaly outputs."""
 from __future__ import annotations
 
-from typing import Set
-
 import pandas as pd
 
 
-def merge_results(transactions: pd.DataFrame, rule_matches: pd.DataFrame) -> pd.DataFrame:
-    """Combine raw transactions with rule match results."""
-    merged = transactions.copy()
+def merge_results(
+    transactions: pd.DataFrame, rule_matches: pd.DataFrame, inplace: bool = False
+) -> pd.DataFrame:
+    """Combine raw transactions with rule match results.
+
+    With ``inplace=True`` the ``rule_alert`` column is added to ``transactions`` itself.
+    """
+    merged = transactions if inplace else transactions.copy(deep=False)
     if "txn_id" not in merged.columns:
         raise ValueError("Transactions dataframe requires a 'txn_id' column.")
 
-    flagged_ids: Set[str] = set()
     if isinstance(rule_matches, pd.DataFrame) and not rule_matches.empty:
-        flagged_ids = set(rule_matches["txn_id"].astype(str).tolist())
-
-    merged["rule_alert"] = merged["txn_id"].astype(str).isin(flagged_ids)
+        merged["rule_alert"] = merged["txn_id"].isin(rule_matches["txn_id"].unique())
+    else:
+        merged["rule_alert"] = False
     return merged
@@ -5,18 +5,20 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import numpy as np
+import orjson
 import pandas as pd
 
 from . import learn
 
 
 def _coerce_value(value: Any) -> Any:
-    if pd.isna(value):
-        return None
+    # Cheap isinstance checks first; pd.isna is only needed for NA/NaT sentinels.
     if isinstance(value, pd.Timestamp):
         return value.isoformat()
     if isinstance(value, (np.generic,)):
-        return value.item()
+        return None if pd.isna(value) else value.item()
+    if pd.isna(value):
+        return None
     return value
 
 
@@ -24,10 +26,33 @@ def _to_python_records(frame: pd.DataFrame, columns: List[str]) -> List[Dict[str
     if frame.empty:
         return []
     trimmed = frame.loc[:, [col for col in columns if col in frame.columns]]
-    records = []
-    for record in trimmed.to_dict(orient="records"):
-        records.append({key: _coerce_value(val) for key, val in record.items()})
-    return records
+    # orjson serialises natives, NaN and numpy scalars in C; _coerce_value only sees the rest.
+    payload = orjson.dumps(
+        trimmed.to_dict(orient="records"),
+        default=_coerce_value,
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+    return orjson.loads(payload)
+
+
+def _top_n_positions(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """Positions of the ``top_n`` largest scores, matching ``nlargest(keep="first")``."""
+    missing = np.isnan(scores)
+    valid = np.flatnonzero(~missing)
+    k = min(max(top_n, 0), valid.size)
+    values = scores[valid]
+    if k < valid.size:
+        # O(N) selection of the k-th largest value, then resolve ties at the cut by position.
+        cut = np.partition(values, values.size - k)[values.size - k] if k else np.inf
+        above = np.flatnonzero(values > cut)
+        ties = np.flatnonzero(values == cut)[: k - above.size]
+        picked = np.concatenate([above, ties])
+    else:
+        picked = np.arange(values.size)
+    order = np.lexsort((picked, -values[picked]))
+    # Like nlargest, fill up with NaN rows (in order) once the scored rows run out.
+    padding = np.flatnonzero(missing)[: max(top_n, 0) - k]
+    return np.concatenate([valid[picked[order]], padding])
 
 
 def generate_report(
@@ -43,12 +68,15 @@ def generate_report(
     }
 
     if "anomaly_score" in enriched.columns:
-        summary["max_anomaly_score"] = float(enriched["anomaly_score"].max())
+        scores = enriched["anomaly_score"].to_numpy(dtype=np.float64, na_value=np.nan)
+        scored = scores[~np.isnan(scores)]
+        summary["max_anomaly_score"] = scored.max().item() if scored.size else float("nan")
         if "is_anomalous" in enriched.columns:
-            summary["anomalies_over_threshold"] = int(enriched["is_anomalous"].sum())
+            flags = enriched["is_anomalous"].to_numpy(dtype=bool, na_value=False)
+            summary["anomalies_over_threshold"] = int(np.count_nonzero(flags))
         else:
             summary["anomalies_over_threshold"] = 0
-        top_anomalies = enriched.nlargest(top_n, "anomaly_score")
+        top_anomalies = enriched.iloc[_top_n_positions(scores, top_n)]
         summary["top_anomalies"] = _to_python_records(
             top_anomalies, ["txn_id", "amount", "anomaly_score", "rule_alert"]
         )
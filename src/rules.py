@@ -1,8 +1,15 @@
 # src/rules.py
 from __future__ import annotations
+import operator as operator_module
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from datetime import timedelta
-from typing import Dict, List, Any
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+from typing import Any, Callable, Dict, List
+
+_HIT_COLUMNS = ["txn_id", "rule", "severity", "reason"]
 
 # ------------------------------
 # Helpers
@@ -10,7 +17,8 @@ from typing import Dict, List, Any
 
 def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Add safe defaults for expected columns if missing."""
-    df = df.copy()
+    # Shallow copy: columns are only added or replaced, never written into.
+    df = df.copy(deep=False)
     defaults = {
         "kyc_verified": True,
         "pep_flag": False,
@@ -24,16 +32,47 @@ def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = default
     # Normalize common fields to reduce case-mismatch bugs
     if "currency" in df.columns:
-        df["currency"] = df["currency"].astype(str).str.upper()
+        df["currency"] = _normalized_categorical(df["currency"], str.upper)
     if "country_src" in df.columns:
-        df["country_src"] = df["country_src"].astype(str).str.upper()
+        df["country_src"] = _normalized_categorical(df["country_src"], str.upper)
     if "country_dst" in df.columns:
-        df["country_dst"] = df["country_dst"].astype(str).str.upper()
+        df["country_dst"] = _normalized_categorical(df["country_dst"], str.upper)
     if "channel" in df.columns:
-        df["channel"] = df["channel"].astype(str).str.lower()
+        df["channel"] = _normalized_categorical(df["channel"], str.lower)
     return df
 
 
+def _normalized_categorical(series: pd.Series, transform: Callable[[str], str]) -> pd.Series:
+    """Return series as a categorical with transform applied to its labels, not its rows."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    renamed = pd.Index([transform(str(c)) for c in series.cat.categories])
+    if renamed.is_unique:
+        return series.cat.rename_categories(renamed)
+    # Labels that only differ by case collapse onto one category; -1 stays missing.
+    labels = renamed.unique()
+    remap = np.append(labels.get_indexer(renamed), -1)
+    codes = remap[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=series.index, name=series.name)
+
+
+def _isin_mask(series: pd.Series, values: Any) -> np.ndarray:
+    """Boolean ndarray of series.isin(values); categoricals are matched on integer codes."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Resolve the label set once per category, then gather by code (-1 -> False).
+        per_code = np.append(series.cat.categories.isin(list(values)), False)
+        return per_code[series.cat.codes.to_numpy()]
+    return series.isin(list(values)).to_numpy(dtype=bool)
+
+
+def _lookup(series: pd.Series, mapping: Dict[Any, float], default: float) -> np.ndarray:
+    """Per-row float lookup of series values in mapping, with default for the rest."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        per_label = np.array([mapping.get(c, default) for c in series.cat.categories] + [default], dtype=np.float64)
+        return per_label[series.cat.codes.to_numpy()]
+    return series.map(mapping).fillna(default).to_numpy(dtype=np.float64)
+
+
 def _thr_for_currency(cfg: Dict[str, Any], cur: str) -> float:
     """Pick per-currency threshold if available, else global USD fallback."""
     tpc = cfg.get("thresholds_per_currency", {}) or {}
@@ -41,133 +80,197 @@ def _thr_for_currency(cfg: Dict[str, Any], cur: str) -> float:
     return float(tpc.get(cur, global_thr))
 
 
-def _append_hits(rows: List[dict], df_subset: pd.DataFrame, rule_id: str, severity: float, mk_reason) -> None:
-    """Append standardized hits to rows. mk_reason(row) -> str."""
-    for r in df_subset.itertuples(index=False):
-        rows.append({
-            "txn_id": r.txn_id,
-            "rule": rule_id,
-            "severity": float(severity),
-            "reason": mk_reason(r)
-        })
+def _rule_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Extract the columns and boolean flags read by the row-wise rules, once per run."""
+    return {
+        "txn_id": df["txn_id"].to_numpy(),
+        "amount": df["amount"].to_numpy(dtype=np.float64, na_value=np.nan),
+        "currency": df["currency"].to_numpy(),
+        "country_src": df["country_src"].to_numpy(),
+        "country_dst": df["country_dst"].to_numpy(),
+        "channel": df["channel"].to_numpy(),
+        "kyc_missing": (df["kyc_verified"].fillna(False) == False).to_numpy(dtype=bool),
+        "is_pep": (df["pep_flag"].fillna(False) == True).to_numpy(dtype=bool),
+    }
+
+
+def _customer_currency_groups(df: pd.DataFrame) -> Dict[Any, np.ndarray]:
+    """Row positions per (customer_id, currency), computed once and shared by rules."""
+    grouped = df.groupby(["customer_id", "currency"], sort=False, dropna=False, observed=True)
+    return grouped.indices
+
+
+def _naive_timestamps(series: pd.Series) -> np.ndarray:
+    """Timestamps as naive-UTC datetime64 values; unparseable entries become NaT."""
+    if not is_datetime64_any_dtype(series):
+        series = pd.to_datetime(series, errors="coerce", utc=True)
+    if series.dt.tz is not None:
+        series = series.dt.tz_convert(None)
+    return series.to_numpy()
+
+
+def _as_text(values: Any) -> pa.Array:
+    """Render values as an Arrow string array for reason strings, the way str() would."""
+    values = np.asarray(values)
+    if values.dtype.kind in "biuf":
+        # NumPy formats numbers like str(); Arrow's cast would print 15000.0 as "15000".
+        return pa.array(values.astype(str))
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array(values.astype(str))
+
+
+def _join_text(*parts: Any) -> np.ndarray:
+    """Concatenate string scalars and arrays element-wise; missing values render as 'nan'."""
+    joined = pc.binary_join_element_wise(*parts, "", null_handling="replace", null_replacement="nan")
+    return joined.to_numpy(zero_copy_only=False)
+
+
+def _hits_at(txn_ids: np.ndarray, rule_id: str, severity: float, reason: Any) -> pd.DataFrame:
+    """Build standardized hits for txn_ids. reason is a str or an array aligned to txn_ids."""
+    return pd.DataFrame({
+        "txn_id": txn_ids,
+        "rule": rule_id,
+        "severity": float(severity),
+        "reason": reason,
+    }, columns=_HIT_COLUMNS)
+
+
+def _concat_hits(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-rule hit frames into a single standardized DataFrame."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=_HIT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
 
 
 # ------------------------------
 # Individual rules
 # ------------------------------
 
-def rule_large_txn_currency_aware(df: pd.DataFrame, cfg: Dict[str, Any]) -> List[dict]:
+def rule_large_txn_currency_aware(
+    df: pd.DataFrame, cfg: Dict[str, Any], cols: Dict[str, np.ndarray] | None = None
+) -> pd.DataFrame:
     """Flag amounts above per-currency threshold."""
-    hits: List[dict] = []
-    for cur, g in df.groupby("currency", dropna=False):
-        thr = _thr_for_currency(cfg, cur)
-        m = g["amount"] > thr
-        _append_hits(
-            hits,
-            g[m],
-            "R2_LARGE",
-            0.6,
-            lambda r, t=thr, c=cur: f"Amount {r.amount} {c} > {t} {c}"
-        )
-    return hits
-
-
-def rule_structuring_currency_aware(df: pd.DataFrame, cfg: Dict[str, Any]) -> List[dict]:
+    cols = _rule_columns(df) if cols is None else cols
+    tpc = {k: float(v) for k, v in (cfg.get("thresholds_per_currency", {}) or {}).items()}
+    global_thr = float(cfg["thresholds"]["large_txn_usd"])
+    thr = _lookup(df["currency"], tpc, global_thr)
+    idx = np.flatnonzero(cols["amount"] > thr)
+    cur = _as_text(cols["currency"][idx])
+    return _hits_at(
+        cols["txn_id"][idx],
+        "R2_LARGE",
+        0.6,
+        _join_text("Amount ", _as_text(df["amount"].to_numpy()[idx]), " ", cur, " > ", _as_text(thr[idx]), " ", cur)
+    )
+
+
+def rule_structuring_currency_aware(
+    df: pd.DataFrame,
+    cfg: Dict[str, Any],
+    cols: Dict[str, np.ndarray] | None = None,
+    groups: Dict[Any, np.ndarray] | None = None,
+) -> pd.DataFrame:
     """
     Flag 'structuring' (smurfing): >=N near-threshold txns within rolling window,
     per (customer, currency).
+
+    groups maps (customer_id, currency) to row positions, as from groupby(...).indices.
     """
     base = float(cfg["thresholds"]["large_txn_usd"])
     band = float(cfg["thresholds"]["near_threshold_band"])
     min_ev = int(cfg["thresholds"]["structuring_min_events"])
     win_m = int(cfg["thresholds"]["structuring_window_minutes"])
 
-    d = df.copy()
-    d["ts"] = pd.to_datetime(d["timestamp"], errors="coerce")
+    cols = _rule_columns(df) if cols is None else cols
+    groups = _customer_currency_groups(df) if groups is None else groups
+    ts_all = _naive_timestamps(df["timestamp"])
+    amount = cols["amount"]
+    window = np.timedelta64(win_m, "m")
 
-    hits: List[dict] = []
+    frames: List[pd.DataFrame] = []
     # Per (customer, currency) profile
-    for (cid, cur), g in d.groupby(["customer_id", "currency"], dropna=False):
+    for (cid, cur), pos in groups.items():
         thr = _thr_for_currency(cfg, cur)
         lo, hi = thr - band, thr - 1
-        gg = g[g["amount"].between(lo, hi, inclusive="both")].sort_values("ts")
-        if gg.empty:
+        a = amount[pos]
+        pos = pos[(a >= lo) & (a <= hi) & ~np.isnat(ts_all[pos])]
+        if pos.size < min_ev:
             continue
-        idx = gg.index.tolist()
-        for i in range(len(idx)):
-            start = gg.loc[idx[i], "ts"]
-            end = start + timedelta(minutes=win_m)
-            within = gg[(gg["ts"] >= start) & (gg["ts"] <= end)]
-            if len(within) >= min_ev:
-                _append_hits(
-                    hits,
-                    within,
+        pos = pos[np.argsort(ts_all[pos], kind="stable")]
+        # Sorted sweep: window i spans every txn with ts in [ts[i], ts[i] + window].
+        ts = ts_all[pos]
+        starts = ts.searchsorted(ts, side="left")
+        ends = ts.searchsorted(ts + window, side="right")
+        for start, end in zip(starts, ends):
+            n = int(end - start)
+            if n >= min_ev:
+                frames.append(_hits_at(
+                    cols["txn_id"][pos[start:end]],
                     "R1_STRUCT",
                     0.9,
-                    lambda r, n=len(within), w=win_m, c=cur, t=thr:
-                        f"{n} near-threshold txns within {w}m for customer {cid} in {c} (≈thr {t})"
-                )
-    return hits
+                    f"{n} near-threshold txns within {win_m}m for customer {cid} in {cur} (≈thr {thr})"
+                ))
+    return _concat_hits(frames)
 
 
-def rule_risky_corridor(df: pd.DataFrame, cfg: Dict[str, Any]) -> List[dict]:
+def rule_risky_corridor(
+    df: pd.DataFrame, cfg: Dict[str, Any], cols: Dict[str, np.ndarray] | None = None
+) -> pd.DataFrame:
     """Flag if either source or destination country is in high-risk list."""
     hr = set(cfg.get("high_risk_countries", []))
     if not hr:
-        return []
-    m = df["country_src"].isin(hr) | df["country_dst"].isin(hr)
-    hits: List[dict] = []
-    _append_hits(
-        hits,
-        df[m],
+        return pd.DataFrame(columns=_HIT_COLUMNS)
+    cols = _rule_columns(df) if cols is None else cols
+    m = _isin_mask(df["country_src"], hr) | _isin_mask(df["country_dst"], hr)
+    idx = np.flatnonzero(m)
+    return _hits_at(
+        cols["txn_id"][idx],
         "R3_RISKY_COUNTRY",
         0.5,
-        lambda r: f"High-risk corridor {r.country_src}->{r.country_dst}"
+        _join_text("High-risk corridor ", _as_text(cols["country_src"][idx]), "->", _as_text(cols["country_dst"][idx]))
     )
-    return hits
 
 
-def rule_cross_border_cash(df: pd.DataFrame) -> List[dict]:
+def rule_cross_border_cash(df: pd.DataFrame, cols: Dict[str, np.ndarray] | None = None) -> pd.DataFrame:
     """Flag cross-border cash transactions."""
-    m = (df["channel"] == "cash") & (df["country_src"] != df["country_dst"])
-    hits: List[dict] = []
-    _append_hits(
-        hits,
-        df[m],
+    cols = _rule_columns(df) if cols is None else cols
+    m = (cols["channel"] == "cash") & (cols["country_src"] != cols["country_dst"])
+    idx = np.flatnonzero(m)
+    return _hits_at(
+        cols["txn_id"][idx],
         "R6_CASH_XBORDER",
         0.6,
-        lambda r: f"Cross-border cash {r.country_src}->{r.country_dst}"
+        _join_text("Cross-border cash ", _as_text(cols["country_src"][idx]), "->", _as_text(cols["country_dst"][idx]))
     )
-    return hits
 
 
-def rule_kyc_required(df: pd.DataFrame) -> List[dict]:
+def rule_kyc_required(df: pd.DataFrame, cols: Dict[str, np.ndarray] | None = None) -> pd.DataFrame:
     """Flag missing/unverified KYC."""
-    m = df["kyc_verified"].fillna(False) == False
-    hits: List[dict] = []
-    _append_hits(
-        hits,
-        df[m],
+    cols = _rule_columns(df) if cols is None else cols
+    return _hits_at(
+        cols["txn_id"][cols["kyc_missing"]],
         "R4_KYC",
         0.7,
-        lambda r: "Missing/unverified KYC"
+        "Missing/unverified KYC"
     )
-    return hits
 
 
-def rule_pep(df: pd.DataFrame, cfg: Dict[str, Any]) -> List[dict]:
+def rule_pep(
+    df: pd.DataFrame, cfg: Dict[str, Any], cols: Dict[str, np.ndarray] | None = None
+) -> pd.DataFrame:
     """Flag PEP transactions above PEP threshold."""
     pep_thr = float(cfg.get("thresholds", {}).get("pep_txn_usd", 5000))
-    m = (df["pep_flag"].fillna(False) == True) & (df["amount"] > pep_thr)
-    hits: List[dict] = []
-    _append_hits(
-        hits,
-        df[m],
+    cols = _rule_columns(df) if cols is None else cols
+    idx = np.flatnonzero(cols["is_pep"] & (cols["amount"] > pep_thr))
+    return _hits_at(
+        cols["txn_id"][idx],
         "R5_PEP",
         0.8,
-        lambda r, t=pep_thr: f"PEP transaction over threshold ({r.amount} > {t})"
+        _join_text("PEP transaction over threshold (", _as_text(df["amount"].to_numpy()[idx]), f" > {pep_thr})")
     )
-    return hits
 
 
 # ------------------------------
@@ -178,26 +281,36 @@ def run_rules(df: pd.DataFrame, cfg: Dict[str, Any]) -> pd.DataFrame:
     """
     Apply all enabled rules and return a standardized DataFrame:
     columns = ["txn_id", "rule", "severity", "reason"].
+
+    With cfg["parallel_rules"] set, the rules run concurrently on a thread pool;
+    they only read the shared frame, and pandas/NumPy release the GIL in their kernels.
     """
     df = _ensure_columns(df)
-    rows: List[dict] = []
+    # Shared NumPy views and group positions so rules do not each re-read the frame.
+    cols = _rule_columns(df)
+    groups = _customer_currency_groups(df)
 
     # Always-on rules
-    rows += rule_large_txn_currency_aware(df, cfg)
-    rows += rule_structuring_currency_aware(df, cfg)
-    rows += rule_risky_corridor(df, cfg)
-    rows += rule_cross_border_cash(df)
+    tasks: List[Callable[[], pd.DataFrame]] = [
+        lambda: rule_large_txn_currency_aware(df, cfg, cols),
+        lambda: rule_structuring_currency_aware(df, cfg, cols, groups),
+        lambda: rule_risky_corridor(df, cfg, cols),
+        lambda: rule_cross_border_cash(df, cols),
+    ]
 
     # Config-toggled rules
     if cfg.get("kyc_required", False):
-        rows += rule_kyc_required(df)
+        tasks.append(lambda: rule_kyc_required(df, cols))
 
     if cfg.get("pep_watchlist", False):
-        rows += rule_pep(df, cfg)
+        tasks.append(lambda: rule_pep(df, cfg, cols))
 
-    if not rows:
-        return pd.DataFrame(columns=["txn_id", "rule", "severity", "reason"])
-    return pd.DataFrame(rows, columns=["txn_id", "rule", "severity", "reason"])
+    if cfg.get("parallel_rules", False):
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            frames = list(pool.map(lambda task: task(), tasks))
+    else:
+        frames = [task() for task in tasks]
+    return _concat_hits(frames)
 
 
 # ------------------------------
@@ -236,6 +349,7 @@ def _normalize_modern_config(cfg: Dict[str, Any] | None) -> Dict[str, Any]:
     normalized.setdefault("high_risk_countries", [])
     normalized.setdefault("kyc_required", False)
     normalized.setdefault("pep_watchlist", False)
+    normalized.setdefault("parallel_rules", False)
     return normalized
 
 
@@ -246,21 +360,28 @@ def _safe_series(df: pd.DataFrame, field: str) -> pd.Series:
     return pd.Series([None] * len(df), index=df.index)
 
 
+_NUMERIC_COMPARATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "greater_than": operator_module.gt,
+    "greater_than_or_equal": operator_module.ge,
+    "less_than": operator_module.lt,
+    "less_than_or_equal": operator_module.le,
+}
+
+
+def _as_numbers(series: pd.Series) -> pd.Series:
+    """Return series as numbers, skipping the conversion when it is already numeric."""
+    if is_numeric_dtype(series.dtype):
+        return series
+    return pd.to_numeric(series, errors="coerce")
+
+
 def _legacy_condition_mask(series: pd.Series, operator: str, value: Any) -> pd.Series:
     """Evaluate a simple rule condition and return a boolean mask."""
     op = (operator or "").lower()
-    if op in {"greater_than", "greater_than_or_equal"}:
-        numbers = pd.to_numeric(series, errors="coerce")
+    if op in _NUMERIC_COMPARATORS:
         if value is None:
-            return numbers > float("inf")  # Always False
-        comparator = float(value)
-        mask = numbers > comparator if op == "greater_than" else numbers >= comparator
-    elif op in {"less_than", "less_than_or_equal"}:
-        numbers = pd.to_numeric(series, errors="coerce")
-        if value is None:
-            return numbers < float("-inf")  # Always False
-        comparator = float(value)
-        mask = numbers < comparator if op == "less_than" else numbers <= comparator
+            return pd.Series(False, index=series.index)
+        mask = _NUMERIC_COMPARATORS[op](_as_numbers(series), float(value))
     elif op in {"equals", "equal"}:
         mask = series == value
     elif op in {"not_equals", "not_equal"}:
@@ -322,6 +443,14 @@ def _apply_legacy_rules(df: pd.DataFrame, rules_cfg: Dict[str, Any]) -> pd.DataF
     return _finalise_result(combined)
 
 
+def referenced_fields(cfg: Dict[str, Any] | None) -> List[str]:
+    """Return the transaction fields referenced by legacy rule definitions."""
+    rules_list = (cfg or {}).get("rules", [])
+    if not isinstance(rules_list, list):
+        return []
+    return [rule["field"] for rule in rules_list if isinstance(rule, dict) and "field" in rule]
+
+
 def apply_rules(df: pd.DataFrame, cfg: Dict[str, Any] | None) -> pd.DataFrame:
     """
     Backwards-compatible entry point expected by the rest of the pipeline.
@@ -1,14 +1,29 @@
 """Shared utility helpers for the AML pipeline."""
 from __future__ import annotations
 
+import copy
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
 import yaml
 
+try:  # libyaml bindings are much faster but not present in every PyYAML build
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was installed
+    from yaml import SafeLoader as _YamlLoader
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file; ``mtime_ns`` is part of the cache key so edits are picked up."""
+    with open(path_str, "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=_YamlLoader) or {}
+
 
 def load_yaml(path: Path | str) -> Dict[str, Any]:
     """Load a YAML file and return an empty dict if the file is blank."""
-    file_path = Path(path)
-    with file_path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+    file_path = Path(path).resolve()
+    parsed = _load_yaml_cached(str(file_path), file_path.stat().st_mtime_ns)
+    # Hand out a copy so callers cannot mutate the cached document.
+    return copy.deepcopy(parsed)
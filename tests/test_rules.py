@@ -28,3 +28,35 @@ def test_apply_rules_flags_high_value_transaction() -> None:
     assert not matches.empty
     assert matches.loc[0, "txn_id"] == "TXN002"
     assert matches.loc[0, "rule_id"] == "high_amount"
+
+
+def test_apply_rules_flags_structuring_within_window() -> None:
+    transactions = pd.DataFrame(
+        [
+            {"txn_id": "T1", "timestamp": "2025-10-01T10:00:00Z", "customer_id": "C1", "amount": 9800, "currency": "USD"},
+            {"txn_id": "T2", "timestamp": "2025-10-01T10:20:00Z", "customer_id": "C1", "amount": 9900, "currency": "USD"},
+            {"txn_id": "T3", "timestamp": "2025-10-01T10:40:00Z", "customer_id": "C1", "amount": 9700, "currency": "USD"},
+            {"txn_id": "T4", "timestamp": "2025-10-01T13:00:00Z", "customer_id": "C1", "amount": 9800, "currency": "USD"},
+        ]
+    )
+
+    matches = apply_rules(transactions, {})
+
+    structuring = matches[matches["rule_id"] == "R1_STRUCT"]
+    assert sorted(structuring["txn_id"]) == ["T1", "T2", "T3"]
+
+
+def test_run_rules_parallel_matches_serial() -> None:
+    transactions = pd.DataFrame(
+        [
+            {"txn_id": "T1", "amount": 25000, "currency": "usd", "country_src": "SG", "country_dst": "RU", "channel": "cash"},
+            {"txn_id": "T2", "amount": 900, "currency": "EUR", "country_src": "SG", "country_dst": "SG", "channel": "wire"},
+        ]
+    ).assign(timestamp="2025-10-01T10:00:00Z", customer_id="C1", kyc_verified=False, pep_flag=True)
+    base_cfg = {"high_risk_countries": ["RU"], "kyc_required": True, "pep_watchlist": True}
+
+    serial = apply_rules(transactions, base_cfg)
+    parallel = apply_rules(transactions, {**base_cfg, "parallel_rules": True})
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert set(serial["rule_id"]) == {"R2_LARGE", "R3_RISKY_COUNTRY", "R4_KYC", "R5_PEP", "R6_CASH_XBORDER"}